@@ -1,5 +1,13 @@
 """Defines API for acled module."""
 from geoacled.acled.acled_query import AcledMonth, AcledYear
 from geoacled.utils.clean import clean_column, strip_accents
+from geoacled.utils.snapshot import (
+    attach_snapshot,
+    detach_snapshot,
+    publish_snapshot,
+    release_snapshot,
+)
 
-__all__ = ['AcledMonth', 'AcledYear', 'clean_column', 'strip_accents']
\ No newline at end of file
+__all__ = ['AcledMonth', 'AcledYear', 'attach_snapshot', 'clean_column',
+           'detach_snapshot', 'publish_snapshot', 'release_snapshot',
+           'strip_accents']
\ No newline at end of file
@@ -2,12 +2,19 @@
 
 This module defines the `GeoAcled` class, which produces an Altair
 LayerChart for a given country, year, and month. ACLED data can be
-provided in three ways:
+provided in four ways:
 
 - a path to a CSV (downloaded from ACLED),
-- a Polars DataFrame containing ACLED-formatted data, or
+- a Polars DataFrame containing ACLED-formatted data,
+- the key of an event snapshot published by another process, or
 - fetched directly from the ACLED API.
 
+Snapshots let multi-process workers share one copy of a large event
+frame: publish it once with `publish_snapshot` (or
+`GeoAcled.publish_snapshot`) and pass the returned key as `snapshot`.
+Set `snapshot_shared=True` when the key refers to a shared-memory
+segment rather than a memory-mapped file in SNAPSHOT_DIR.
+
 A Postgres-backed cache is optionally supported to avoid exceeding ACLED
 API rate limits. When using the API or the Postgres cache layer, a .env
 file must exist at the project root with the following variables:
@@ -21,9 +28,12 @@ DB_PASS="my_secret_db_password"
 DB="my_database_name"
 DB_ADDRESS="my_database_address"
 
+SNAPSHOT_DIR="/dev/shm"   # Optional, defaults to the system temp dir
+
 Example:
 -------
-    from geoacled import GeoAcled
+    from geoacled import AcledMonth, publish_snapshot
+    from geoacled.geoacled import GeoAcled
 
     geo = GeoAcled(
         country="Mexico",
@@ -36,6 +46,11 @@ Example:
 
     chart = geo.chorolpleth_chart
 
+    # Share one copy of the events across worker processes
+    events = AcledMonth(country="Mexico", year=2024, month=1).df
+    key = publish_snapshot(events)
+    worker_geo = GeoAcled(country="Mexico", year=2024, month=1, snapshot=key)
+
 """
 
 from dataclasses import dataclass
@@ -50,6 +65,7 @@ from geoacled.geoacled_types import FeatureCollection
 from geoacled.geojson import build_geo_df, get_region_list
 from geoacled.utils.clean import clean_column, clean_set_to_dataframe
 from geoacled.utils.fetch import fetch_acled_month, fetch_geojson
+from geoacled.utils.snapshot import attach_snapshot, publish_snapshot
 
 
 class PipelineRuntimeError(RuntimeError):
@@ -64,10 +80,23 @@ class GeoAcled:
     adm: str  = 'ADM1'
     csv: str | None = None
     df: pl.DataFrame | None = None
+    snapshot: str | None = None
+    snapshot_shared: bool = False
+
+    def publish_snapshot(self) -> str:
+        """Publish the loaded ACLED frame and return its snapshot key."""
+        return publish_snapshot(self.acled_df, shared=self.snapshot_shared)
 
     def _fetch_acled(self) -> pl.DataFrame:
         if self.df is not None:
             return self.df
+        if self.snapshot:
+            try:
+                return attach_snapshot(self.snapshot,
+                                       shared=self.snapshot_shared)
+            except Exception as e:
+                error_msg = 'Error attaching ACLED snapshot'
+                raise PipelineRuntimeError(error_msg, e) from e
         if self.csv:
             return pl.read_csv(self.csv)
         try:
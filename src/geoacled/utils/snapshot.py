@@ -0,0 +1,270 @@
+"""Share loaded ACLED event frames between worker processes.
+
+A frame is published once as an uncompressed Arrow IPC file, either on
+disk (memory-mapped by readers) or in a POSIX shared-memory segment, under
+a key derived from its content. Workers attach to the key and get a Polars
+DataFrame backed by the shared pages instead of a private copy.
+
+The on-disk location defaults to the system temp directory and can be set
+with SNAPSHOT_DIR in .env. Shared-memory publishers of the same key take
+turns on a small lock file there.
+"""
+
+import contextlib
+import fcntl
+import hashlib
+import mmap
+import os
+import tempfile
+from multiprocessing import resource_tracker, shared_memory
+from pathlib import Path
+
+import dotenv
+import polars as pl
+import pyarrow as pa
+
+_ = dotenv.load_dotenv()
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', tempfile.gettempdir())
+SHM_PREFIX = 'geoacled_'
+SHM_HEADER = 8
+HASH_CHUNK = 1 << 20
+
+# Mappings reused across attaches. Frames hold their own reference, so a
+# detached mapping is unmapped once the last frame viewing it is dropped.
+_ATTACHED: dict[str, mmap.mmap] = {}
+
+
+class _HashSink:
+    """Write-only stream that hashes and sizes IPC bytes without keeping them."""
+
+    def __init__(self) -> None:
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self.closed = False
+
+    def write(self, data: bytes) -> int:
+        self.digest.update(data)
+        self.size += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.size
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        self.closed = True
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while chunk := f.read(HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _snapshot_path(key: str, directory: str | None) -> Path:
+    return Path(directory or SNAPSHOT_DIR) / f'{key}.arrow'
+
+
+def _shm_name(key: str) -> str:
+    # macOS caps POSIX shared-memory names at 31 characters.
+    return f'{SHM_PREFIX}{key[:16]}'
+
+
+def _open_shm(key: str) -> shared_memory.SharedMemory:
+    shm = shared_memory.SharedMemory(name=_shm_name(key))
+    # Attaching registers the segment with this process's resource
+    # tracker, which would unlink it when the worker exits.
+    resource_tracker.unregister(shm._name, 'shared_memory')  # noqa: SLF001
+    return shm
+
+
+@contextlib.contextmanager
+def _publish_lock(key: str):
+    path = Path(SNAPSHOT_DIR) / f'.{_shm_name(key)}.lock'
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'a') as f:
+        fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _map_shm(key: str) -> mmap.mmap:
+    shm = _open_shm(key)
+    # Map the segment ourselves so SharedMemory can close without
+    # tripping over buffers still exported to Arrow.
+    try:
+        return mmap.mmap(shm._fd, shm.size, prot=mmap.PROT_READ)  # noqa: SLF001
+    finally:
+        shm.close()
+
+
+def _publish_file(df: pl.DataFrame, directory: str | None) -> str:
+    target = Path(directory or SNAPSHOT_DIR)
+    target.mkdir(parents=True, exist_ok=True)
+    fd, name = tempfile.mkstemp(dir=target, prefix='.', suffix='.arrow')
+    os.close(fd)
+    tmp = Path(name)
+    try:
+        df.write_ipc(tmp, compression='uncompressed')
+        key = _hash_file(tmp)
+        path = _snapshot_path(key, directory)
+        if not path.exists():
+            tmp.replace(path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return key
+
+
+def _write_ipc(table: pa.Table, sink: object) -> None:
+    with pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def _shm_size(shm: shared_memory.SharedMemory) -> int:
+    return int.from_bytes(shm.buf[:SHM_HEADER], 'little')
+
+
+def _fill_shm(shm: shared_memory.SharedMemory,
+              table: pa.Table,
+              size: int) -> None:
+    payload = pa.py_buffer(shm.buf[SHM_HEADER:SHM_HEADER + size])
+    _write_ipc(table, pa.FixedSizeBufferWriter(payload))
+
+
+def _needs_shm(key: str, size: int) -> bool:
+    """Return whether key needs a new segment, clearing any half-written one.
+
+    Callers hold the publish lock, so an existing segment with a bad
+    header was left by a publisher that died, not one still filling it.
+    """
+    try:
+        shm = _open_shm(key)
+    except FileNotFoundError:
+        pass
+    else:
+        if _shm_size(shm) == size:
+            shm.close()
+            return False
+        resource_tracker.register(shm._name, 'shared_memory')  # noqa: SLF001
+        shm.unlink()
+        shm.close()
+    return True
+
+
+def _publish_shm(df: pl.DataFrame) -> str:
+    # Keep string views so the conversion shares the frame's buffers.
+    table = df.to_arrow(compat_level=pl.CompatLevel.newest())
+    # Hash and size the IPC stream up front so it can be written straight
+    # into a segment named after its key, without an in-memory copy.
+    hash_sink = _HashSink()
+    _write_ipc(table, hash_sink)
+    key, size = hash_sink.digest.hexdigest(), hash_sink.size
+    with _publish_lock(key):
+        if not _needs_shm(key, size):
+            return key
+        shm = shared_memory.SharedMemory(name=_shm_name(key),
+                                         create=True,
+                                         size=SHM_HEADER + size)
+        try:
+            _fill_shm(shm, table, size)
+            # The length doubles as the ready marker, so write it last.
+            shm.buf[:SHM_HEADER] = size.to_bytes(SHM_HEADER, 'little')
+        except BaseException:
+            shm.unlink()
+            raise
+        finally:
+            shm.close()
+        resource_tracker.unregister(shm._name, 'shared_memory')  # noqa: SLF001
+    return key
+
+
+def publish_snapshot(df: pl.DataFrame,
+                     shared: bool = False,
+                     directory: str | None = None) -> str:
+    """Publish an event frame and return its content key.
+
+    Publishing the same content twice is a no-op returning the same key.
+    With shared=True the frame is written to a shared-memory segment that
+    persists until release_snapshot is called; otherwise it is written to
+    directory (default SNAPSHOT_DIR).
+    """
+    if shared:
+        return _publish_shm(df)
+    return _publish_file(df, directory)
+
+
+def _frame_from_ipc(key: str,
+                    source: pa.Buffer | pa.NativeFile) -> pl.DataFrame:
+    frame = pl.from_arrow(pa.ipc.open_file(source).read_all(), rechunk=False)
+    if not isinstance(frame, pl.DataFrame):
+        raise TypeError(f'Snapshot {key} is not a table')
+    return frame
+
+
+def _segment_payload(key: str, segment: mmap.mmap) -> pa.Buffer:
+    size = int.from_bytes(segment[:SHM_HEADER], 'little')
+    if not 0 < size <= len(segment) - SHM_HEADER:
+        raise ValueError(f'Snapshot {key} is incomplete or corrupt')
+    return pa.py_buffer(segment).slice(SHM_HEADER, size)
+
+
+def attach_snapshot(key: str,
+                    shared: bool = False,
+                    directory: str | None = None) -> pl.DataFrame:
+    """Return a zero-copy Polars view of a published event frame."""
+    if not shared:
+        path = _snapshot_path(key, directory)
+        return _frame_from_ipc(key, pa.memory_map(str(path)))
+    segment = _ATTACHED.get(key)
+    if segment is None:
+        segment = _map_shm(key)
+        try:
+            payload = _segment_payload(key, segment)
+        except ValueError:
+            segment.close()
+            raise
+        _ATTACHED[key] = segment
+    else:
+        payload = _segment_payload(key, segment)
+    return _frame_from_ipc(key, payload)
+
+
+def detach_snapshot(key: str) -> None:
+    """Drop this process's mapping of a shared-memory event frame.
+
+    The pages are unmapped now, or once the last frame attached to them
+    is dropped.
+    """
+    segment = _ATTACHED.pop(key, None)
+    if segment is None:
+        return
+    with contextlib.suppress(BufferError):
+        segment.close()
+
+
+def release_snapshot(key: str,
+                     shared: bool = False,
+                     directory: str | None = None) -> None:
+    """Remove a published event frame.
+
+    Other workers already attached keep their mapping until they detach.
+    """
+    if not shared:
+        _snapshot_path(key, directory).unlink(missing_ok=True)
+        return
+    detach_snapshot(key)
+    with _publish_lock(key):
+        try:
+            shm = _open_shm(key)
+        except FileNotFoundError:
+            return
+        # unlink() unregisters the segment, so hand it back to the tracker.
+        resource_tracker.register(shm._name, 'shared_memory')  # noqa: SLF001
+        shm.unlink()
+        shm.close()
@@ -0,0 +1,113 @@
+import multiprocessing
+import time
+import uuid
+from multiprocessing import shared_memory
+
+import polars as pl
+import pytest
+
+from geoacled.utils import snapshot
+
+CTX = multiprocessing.get_context('spawn')
+
+
+def _events(rows: int = 1000) -> pl.DataFrame:
+    # A unique tag keeps segment names from colliding between runs.
+    return pl.DataFrame({
+        'event_id_cnty': [f'MEX{i}' for i in range(rows)],
+        'admin1': ['Oaxaca', 'Jalisco'] * (rows // 2),
+        'tag': [uuid.uuid4().hex] * rows,
+    })
+
+
+def _attach(key: str, shared: bool, directory: str | None) -> pl.DataFrame:
+    return snapshot.attach_snapshot(key, shared=shared, directory=directory)
+
+
+def _publish(df: pl.DataFrame, shared: bool, directory: str | None) -> str:
+    return snapshot.publish_snapshot(df, shared=shared, directory=directory)
+
+
+def _slow_publish_and_attach(df: pl.DataFrame) -> bool:
+    fill = snapshot._fill_shm
+
+    def slow_fill(*args):
+        time.sleep(1.0)
+        fill(*args)
+
+    snapshot._fill_shm = slow_fill
+    key = snapshot.publish_snapshot(df, shared=True)
+    return snapshot.attach_snapshot(key, shared=True).equals(df)
+
+
+@pytest.fixture(params=[False, True], ids=['file', 'shared'])
+def shared(request):
+    return request.param
+
+
+def test_publish_and_attach(shared, tmp_path):
+    df = _events()
+    key = _publish(df, shared, str(tmp_path))
+    try:
+        assert _publish(df, shared, str(tmp_path)) == key
+        assert _attach(key, shared, str(tmp_path)).equals(df)
+    finally:
+        snapshot.release_snapshot(key, shared=shared, directory=str(tmp_path))
+    assert not list(tmp_path.iterdir())
+    snapshot.release_snapshot(key, shared=shared, directory=str(tmp_path))
+
+
+def test_attach_from_other_process(shared, tmp_path):
+    df = _events()
+    with CTX.Pool(1) as pool:
+        key = pool.apply(_publish, (df, shared, str(tmp_path)))
+        try:
+            assert _attach(key, shared, str(tmp_path)).equals(df)
+            assert pool.apply(_attach, (key, shared, str(tmp_path))).equals(df)
+        finally:
+            snapshot.release_snapshot(key, shared=shared,
+                                      directory=str(tmp_path))
+
+
+def test_concurrent_shared_publishers():
+    df = _events()
+    with CTX.Pool(2) as pool:
+        first = pool.apply_async(_slow_publish_and_attach, (df,))
+        time.sleep(0.5)
+        second = pool.apply_async(_slow_publish_and_attach, (df,))
+        try:
+            assert first.get(timeout=60)
+            assert second.get(timeout=60)
+        finally:
+            snapshot.release_snapshot(_publish(df, True, None), shared=True)
+
+
+def test_incomplete_segment():
+    df = _events()
+    key = _publish(df, True, None)
+    snapshot.release_snapshot(key, shared=True)
+    shm = shared_memory.SharedMemory(name=snapshot._shm_name(key),
+                                     create=True,
+                                     size=64)
+    shm.close()
+    try:
+        with pytest.raises(ValueError, match='incomplete'):
+            snapshot.attach_snapshot(key, shared=True)
+        assert key not in snapshot._ATTACHED
+        assert _publish(df, True, None) == key
+        assert snapshot.attach_snapshot(key, shared=True).equals(df)
+    finally:
+        snapshot.release_snapshot(key, shared=True)
+
+
+def test_detach_snapshot():
+    df = _events()
+    key = _publish(df, True, None)
+    try:
+        snapshot.attach_snapshot(key, shared=True)
+        snapshot.detach_snapshot(key)
+        assert key not in snapshot._ATTACHED
+        assert snapshot.attach_snapshot(key, shared=True).equals(df)
+    finally:
+        snapshot.release_snapshot(key, shared=True)
+    assert key not in snapshot._ATTACHED